@@ -3,19 +3,35 @@
 """Pay out dividends."""
 import json
 import struct
-import decimal
-D = decimal.Decimal
 import logging
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from counterpartylib.lib import (config, exceptions, util, message_type)
 
 FORMAT_1 = '>QQ'
 LENGTH_1 = 8 + 8
+STRUCT_1 = struct.Struct(FORMAT_1)
 FORMAT_2 = '>QQQ'
 LENGTH_2 = 8 + 8 + 8
+STRUCT_2 = struct.Struct(FORMAT_2)
 ID = 50
 
+SQL_ASSET_INFO = '''SELECT
+                        (SELECT divisible FROM issuances WHERE (status = ? AND asset = ?) ORDER BY tx_index ASC LIMIT 1) AS divisible,
+                        (SELECT issuer FROM issuances WHERE (status = ? AND asset = ?) ORDER BY tx_index DESC LIMIT 1) AS issuer'''
+SQL_DIVIDEND_ASSET_INFO = '''SELECT divisible FROM issuances WHERE (status = ? AND asset = ?) ORDER BY tx_index ASC LIMIT 1'''
+SQL_BALANCE = '''SELECT quantity FROM balances WHERE (address = ? AND asset = ?)'''
+SQL_INSERT_DIVIDEND = 'insert into dividends values(:tx_index, :tx_hash, :block_index, :source, :asset, :dividend_asset, :quantity_per_unit, :fee_paid, :status)'
+
 def initialise (db):
     cursor = db.cursor()
     cursor.execute('''CREATE TABLE IF NOT EXISTS dividends(
@@ -39,6 +55,105 @@ def initialise (db):
     cursor.execute('''CREATE INDEX IF NOT EXISTS
                       asset_idx ON dividends (asset)
                    ''')
+    cursor.execute('''CREATE INDEX IF NOT EXISTS
+                      status_fee_idx ON dividends (status, fee_paid)
+                   ''')
+
+if numpy is not None and njit is not None:
+    @njit(cache=True)
+    def dividend_kernel (quantities, quantity_per_unit, divisor, apply_dust, dust_size):
+        """Compiled integer kernel for the per‐holder dividend arithmetic."""
+        dividend_quantities = numpy.empty(quantities.size, dtype=numpy.int64)
+        keep = numpy.ones(quantities.size, dtype=numpy.bool_)
+        for i in range(quantities.size):
+            quantity = quantities[i] * quantity_per_unit
+            if divisor > 1: quantity //= divisor
+            if apply_dust and quantity < dust_size: keep[i] = False
+            dividend_quantities[i] = quantity
+        return dividend_quantities, keep
+else:
+    dividend_kernel = None
+
+def unit_divisor (divisible, dividend_divisible):
+    """Fold the two conditional divisions by config.UNIT into one divisor.
+
+    Successive floor divisions by positive integers compose, so dividing once
+    by the product is exact.
+    """
+    divisor = 1
+    if divisible: divisor *= config.UNIT
+    if not dividend_divisible: divisor *= config.UNIT
+    return divisor
+
+def within_limit (quantities, quantity_per_unit, limit):
+    """Return True if every per‐holder product stays within `limit` in magnitude."""
+    if abs(quantity_per_unit) > limit:
+        return False
+    for bound in (max(quantities), min(quantities)):
+        if abs(bound) > limit or abs(bound * quantity_per_unit) > limit:
+            return False
+    return True
+
+def calculate_dividends (addresses, quantities, escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index):
+    """Calculate per‐holder dividend quantities, vectorising when possible."""
+    # Fall back to arbitrary‐precision arithmetic whenever an intermediate
+    # product could overflow a 64‐bit integer, so that results are always
+    # identical on both paths.
+    if numpy is not None and quantities and within_limit(quantities, quantity_per_unit, 2**63 - 1):
+        return calculate_dividends_numpy(addresses, quantities, escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index)
+    return calculate_dividends_python(addresses, quantities, escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index)
+
+def calculate_dividends_numpy (addresses, quantities, escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index):
+    holder_addresses = numpy.array(addresses, dtype=object)
+    holder_quantities = numpy.fromiter(quantities, dtype=numpy.int64, count=len(quantities))
+
+    keep = numpy.ones(len(quantities), dtype=bool)
+    if block_index < 294500 and not config.TESTNET: # Protocol change.
+        keep &= numpy.fromiter((not escrow for escrow in escrows), dtype=bool, count=len(escrows))
+    if block_index >= 296000 or config.TESTNET: # Protocol change.
+        keep &= (holder_addresses != source)
+
+    divisor = unit_divisor(divisible, dividend_divisible)
+    if dividend_kernel is not None:
+        dividend_quantities, not_dust = dividend_kernel(holder_quantities, quantity_per_unit, divisor, dividend_asset == config.BTC, config.DEFAULT_MULTISIG_DUST_SIZE)
+        keep &= not_dust
+    else:
+        dividend_quantities = holder_quantities * quantity_per_unit
+        if divisor > 1: dividend_quantities //= divisor
+        if dividend_asset == config.BTC:    # A bit hackish.
+            keep &= (dividend_quantities >= config.DEFAULT_MULTISIG_DUST_SIZE)
+
+    outputs = [(address, int(address_quantity), int(dividend_quantity))
+               for address, address_quantity, dividend_quantity
+               in zip(holder_addresses[keep], holder_quantities[keep], dividend_quantities[keep])]
+    holder_count = len({address for address, address_quantity, dividend_quantity in outputs})
+    dividend_total = sum(dividend_quantity for address, address_quantity, dividend_quantity in outputs)
+    return outputs, holder_count, dividend_total
+
+def calculate_dividends_python (addresses, quantities, escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index):
+    skip_escrow = block_index < 294500 and not config.TESTNET   # Protocol change.
+    skip_source = block_index >= 296000 or config.TESTNET       # Protocol change.
+    apply_dust = dividend_asset == config.BTC
+    divisor = unit_divisor(divisible, dividend_divisible)
+
+    outputs = []
+    unique_addresses = set()
+    dividend_total = 0
+    for address, address_quantity, escrow in zip(addresses, quantities, escrows):
+
+        if skip_escrow and escrow: continue
+
+        if skip_source and address == source: continue
+
+        dividend_quantity = address_quantity * quantity_per_unit
+        if divisor > 1: dividend_quantity //= divisor
+        if apply_dust and dividend_quantity < config.DEFAULT_MULTISIG_DUST_SIZE: continue    # A bit hackish.
+
+        outputs.append((address, address_quantity, dividend_quantity))
+        unique_addresses.add(address)
+        dividend_total += dividend_quantity
+
+    return outputs, len(unique_addresses), dividend_total
 
 def validate (db, source, quantity_per_unit, asset, dividend_asset, block_index):
     cursor = db.cursor()
@@ -57,67 +172,45 @@ def validate (db, source, quantity_per_unit, asset, dividend_asset, block_index)
     if quantity_per_unit > config.MAX_INT:
         problems.append('integer overflow')
 
-    # Examine asset.
-    issuances = list(cursor.execute('''SELECT * FROM issuances WHERE (status = ? AND asset = ?) ORDER BY tx_index ASC''', ('valid', asset)))
-    if not issuances:
+    # Examine asset. (One round trip for existence, divisibility and issuer.)
+    issuances = list(cursor.execute(SQL_ASSET_INFO, ('valid', asset, 'valid', asset)))
+    divisible = issuances[0]['divisible']
+    if divisible is None:
         problems.append('no such asset, {}.'.format(asset))
         return None, None, problems, 0
-    divisible = issuances[0]['divisible']
 
     # Only issuer can pay dividends.
     if block_index >= 320000 or config.TESTNET:   # Protocol change.
-        if issuances[-1]['issuer'] != source:
+        if issuances[0]['issuer'] != source:
             problems.append('only issuer can pay dividends')
 
     # Examine dividend asset.
     if dividend_asset in (config.BTC, config.XCP):
         dividend_divisible = True
     else:
-        issuances = list(cursor.execute('''SELECT * FROM issuances WHERE (status = ? AND asset = ?)''', ('valid', dividend_asset)))
+        issuances = list(cursor.execute(SQL_DIVIDEND_ASSET_INFO, ('valid', dividend_asset)))
         if not issuances:
             problems.append('no such dividend asset, {}.'.format(dividend_asset))
             return None, None, problems, 0
         dividend_divisible = issuances[0]['divisible']
 
     # Calculate dividend quantities.
-    holders = util.holders(db, asset)
-    outputs = []
-    addresses = []
-    dividend_total = 0
-    for holder in holders:
-
-        if block_index < 294500 and not config.TESTNET: # Protocol change.
-            if holder['escrow']: continue
-
-        address = holder['address']
-        address_quantity = holder['address_quantity']
-        if block_index >= 296000 or config.TESTNET: # Protocol change.
-            if address == source: continue
-
-        dividend_quantity = address_quantity * quantity_per_unit
-        if divisible: dividend_quantity /= config.UNIT
-        if not dividend_divisible: dividend_quantity /= config.UNIT
-        if dividend_asset == config.BTC and dividend_quantity < config.DEFAULT_MULTISIG_DUST_SIZE: continue    # A bit hackish.
-        dividend_quantity = int(dividend_quantity)
-
-        outputs.append({'address': address, 'address_quantity': address_quantity, 'dividend_quantity': dividend_quantity})
-        addresses.append(address)
-        dividend_total += dividend_quantity
+    holder_addresses, holder_quantities, holder_escrows = util.holders_columnar(db, asset)
+    outputs, holder_count, dividend_total = calculate_dividends(holder_addresses, holder_quantities, holder_escrows, source, quantity_per_unit, divisible, dividend_divisible, dividend_asset, block_index)
 
     if not dividend_total: problems.append('zero dividend')
 
     if dividend_asset != config.BTC:
-        dividend_balances = list(cursor.execute('''SELECT * FROM balances WHERE (address = ? AND asset = ?)''', (source, dividend_asset)))
+        dividend_balances = list(cursor.execute(SQL_BALANCE, (source, dividend_asset)))
         if not dividend_balances or dividend_balances[0]['quantity'] < dividend_total:
             problems.append('insufficient funds ({})'.format(dividend_asset))
 
     fee = 0
     if not problems and dividend_asset != config.BTC:
-        holder_count = len(set(addresses))
         if block_index >= 330000 or config.TESTNET: # Protocol change.
             fee = int(0.0002 * config.UNIT * holder_count)
         if fee:
-            balances = list(cursor.execute('''SELECT * FROM balances WHERE (address = ? AND asset = ?)''', (source, config.XCP)))
+            balances = list(cursor.execute(SQL_BALANCE, (source, config.XCP)))
             if not balances or balances[0]['quantity'] < fee:
                 problems.append('insufficient funds ({})'.format(config.XCP))
 
@@ -143,12 +236,12 @@ def compose (db, source, quantity_per_unit, asset, dividend_asset):
     logger.info('Total quantity to be distributed in dividends: {} {}'.format(util.value_out(db, dividend_total, dividend_asset), dividend_asset))
 
     if dividend_asset == config.BTC:
-        return (source, [(output['address'], output['dividend_quantity']) for output in outputs], None)
+        return (source, [(address, dividend_quantity) for address, address_quantity, dividend_quantity in outputs], None)
 
     asset_id = util.get_asset_id(db, asset, util.CURRENT_BLOCK_INDEX)
     dividend_asset_id = util.get_asset_id(db, dividend_asset, util.CURRENT_BLOCK_INDEX)
     data = message_type.pack(ID)
-    data += struct.pack(FORMAT_2, quantity_per_unit, asset_id, dividend_asset_id)
+    data += STRUCT_2.pack(quantity_per_unit, asset_id, dividend_asset_id)
     return (source, [], data)
 
 def parse (db, tx, message):
@@ -157,12 +250,12 @@ def parse (db, tx, message):
     # Unpack message.
     try:
         if (tx['block_index'] > 288150 or config.TESTNET) and len(message) == LENGTH_2:
-            quantity_per_unit, asset_id, dividend_asset_id = struct.unpack(FORMAT_2, message)
+            quantity_per_unit, asset_id, dividend_asset_id = STRUCT_2.unpack(message)
             asset = util.get_asset_name(db, asset_id, tx['block_index'])
             dividend_asset = util.get_asset_name(db, dividend_asset_id, tx['block_index'])
             status = 'valid'
         elif len(message) == LENGTH_1:
-            quantity_per_unit, asset_id = struct.unpack(FORMAT_1, message)
+            quantity_per_unit, asset_id = STRUCT_1.unpack(message)
             asset = util.get_asset_name(db, asset_id, tx['block_index'])
             dividend_asset = config.XCP
             status = 'valid'
@@ -189,8 +282,7 @@ def parse (db, tx, message):
             util.debit(db, tx['source'], config.XCP, fee, action='dividend fee', event=tx['tx_hash'])
 
         # Credit.
-        for output in outputs:
-            util.credit(db, output['address'], dividend_asset, output['dividend_quantity'], action='dividend', event=tx['tx_hash'])
+        util.credit_many(db, [(address, dividend_asset, dividend_quantity) for address, address_quantity, dividend_quantity in outputs], action='dividend', event=tx['tx_hash'])
 
     # Add parsed transaction to message-type–specific table.
     bindings = {
@@ -206,8 +298,7 @@ def parse (db, tx, message):
     }
 
     if "integer overflow" not in status:
-        sql = 'insert into dividends values(:tx_index, :tx_hash, :block_index, :source, :asset, :dividend_asset, :quantity_per_unit, :fee_paid, :status)'
-        dividend_parse_cursor.execute(sql, bindings)
+        dividend_parse_cursor.execute(SQL_INSERT_DIVIDEND, bindings)
     else:
         logger.warn("Not storing [dividend] tx [%s]: %s" % (tx['tx_hash'], status))
         logger.debug("Bindings: %s" % (json.dumps(bindings), ))
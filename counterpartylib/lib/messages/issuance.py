@@ -110,7 +110,7 @@ def validate (db, source, destination, asset, quantity, divisible, callable_, ca
 
     # Valid re-issuance?
     cursor = db.cursor()
-    cursor.execute('''SELECT * FROM issuances \
+    cursor.execute('''SELECT asset_longname, locked, issuer, divisible, callable, call_date, call_price FROM issuances \
                       WHERE (status = ? AND asset = ?)
                       ORDER BY tx_index ASC''', ('valid', asset))
     issuances = cursor.fetchall()
@@ -210,7 +210,10 @@ def validate (db, source, destination, asset, quantity, divisible, callable_, ca
 
     # For SQLite3
     call_date = min(call_date, config.MAX_INT)
-    total = sum([issuance['quantity'] for issuance in issuances])
+    cursor = db.cursor()
+    total = cursor.execute('''SELECT COALESCE(SUM(quantity), 0) AS total FROM issuances \
+                              WHERE (status = ? AND asset = ?)''', ('valid', asset)).fetchone()['total']
+    cursor.close()
     assert isinstance(quantity, int)
     if total + quantity > config.MAX_INT:
         problems.append('total quantity overflow')
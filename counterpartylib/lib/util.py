@@ -446,6 +446,75 @@ def credit (db, address, asset, quantity, action=None, event=None):
 
     BLOCK_LEDGER.append('{}{}{}{}'.format(block_index, address, asset, quantity))
 
+def credit_many (db, credits, action=None, event=None):
+    """Credit multiple (address, asset, quantity) rows in one batch."""
+    block_index = CURRENT_BLOCK_INDEX
+
+    if not credits:
+        return
+
+    for address, asset, quantity in credits:
+        if type(quantity) != int:
+            raise CreditError('Quantity must be an integer.')
+        if quantity < 0:
+            raise CreditError('Negative quantity.')
+        if quantity > config.MAX_INT:
+            raise CreditError('Quantity can\'t be higher than MAX_INT.')
+        if asset == config.BTC:
+            raise CreditError('Cannot debit bitcoins.')
+
+        # Contracts can only hold XCP balances.
+        if enabled('contracts_only_xcp_balances'): # Protocol change.
+            if len(address) == 40:
+                assert asset == config.XCP
+
+    credit_cursor = db.cursor()
+
+    # Fetch all affected balances at once. (Chunked to respect SQLite's
+    # bound‐parameter limit.)
+    old_balances = {}
+    for credit_asset in {asset for address, asset, quantity in credits}:
+        addresses = list({address for address, asset, quantity in credits if asset == credit_asset})
+        for address_chunk in [addresses[i:i+500] for i in range(0, len(addresses), 500)]:
+            sql = 'SELECT address, quantity FROM balances WHERE (asset = ? AND address IN ({}))'.format(','.join(['?'] * len(address_chunk)))
+            for balance in credit_cursor.execute(sql, [credit_asset] + address_chunk):
+                old_balances[(balance['address'], credit_asset)] = balance['quantity']
+
+    # Compute new balances, keeping repeated addresses cumulative.
+    inserts = []
+    updates = []
+    for address, asset, quantity in credits:
+        if (address, asset) in old_balances:
+            old_balance = old_balances[(address, asset)]
+            assert type(old_balance) == int
+            balance = round(old_balance + quantity)
+            balance = min(balance, config.MAX_INT)
+            updates.append({'quantity': balance, 'address': address, 'asset': asset})
+            old_balances[(address, asset)] = balance
+        else:
+            inserts.append({'address': address, 'asset': asset, 'quantity': quantity})
+            old_balances[(address, asset)] = quantity
+
+    if inserts:
+        credit_cursor.executemany('insert into balances values(:address, :asset, :quantity)', inserts)
+    if updates:
+        credit_cursor.executemany('update balances set quantity = :quantity where (address = :address and asset = :asset)', updates)
+
+    # Record credits.
+    bindings = [{
+        'block_index': block_index,
+        'address': address,
+        'asset': asset,
+        'quantity': quantity,
+        'action': action,
+        'event': event
+    } for address, asset, quantity in credits]
+    credit_cursor.executemany('insert into credits values(:block_index, :address, :asset, :quantity, :action, :event)', bindings)
+    credit_cursor.close()
+
+    for address, asset, quantity in credits:
+        BLOCK_LEDGER.append('{}{}{}{}'.format(block_index, address, asset, quantity))
+
 class QuantityError(Exception): pass
 
 def is_divisible(db, asset):
@@ -518,63 +587,80 @@ def value_out(db, quantity, asset, divisible=None):
 
 ### SUPPLIES ###
 
-def holders(db, asset):
-    """Return holders of the asset."""
-    holders = []
+def holder_rows(db, asset):
+    """Yield (address, quantity, escrow) rows for holders of the asset."""
     cursor = db.cursor()
+    # These scans can be large, so skip the per‐row dict construction of the
+    # connection row tracer and unpack positional rows instead.
+    cursor.setrowtrace(None)
     # Balances
-    cursor.execute('''SELECT * FROM balances \
+    cursor.execute('''SELECT address, quantity FROM balances \
                       WHERE asset = ?''', (asset,))
-    for balance in list(cursor):
-        holders.append({'address': balance['address'], 'address_quantity': balance['quantity'], 'escrow': None})
+    for address, quantity in cursor:
+        yield address, quantity, None
     # Funds escrowed in orders. (Protocol change.)
-    cursor.execute('''SELECT * FROM orders \
+    cursor.execute('''SELECT source, give_remaining, tx_hash FROM orders \
                       WHERE give_asset = ? AND status = ?''', (asset, 'open'))
-    for order in list(cursor):
-        holders.append({'address': order['source'], 'address_quantity': order['give_remaining'], 'escrow': order['tx_hash']})
+    for source, give_remaining, tx_hash in cursor:
+        yield source, give_remaining, tx_hash
     # Funds escrowed in pending order matches. (Protocol change.)
-    cursor.execute('''SELECT * FROM order_matches \
+    cursor.execute('''SELECT tx0_address, forward_quantity, id FROM order_matches \
                       WHERE (forward_asset = ? AND status = ?)''', (asset, 'pending'))
-    for order_match in list(cursor):
-        holders.append({'address': order_match['tx0_address'], 'address_quantity': order_match['forward_quantity'], 'escrow': order_match['id']})
-    cursor.execute('''SELECT * FROM order_matches \
+    for tx0_address, forward_quantity, match_id in cursor:
+        yield tx0_address, forward_quantity, match_id
+    cursor.execute('''SELECT tx1_address, backward_quantity, id FROM order_matches \
                       WHERE (backward_asset = ? AND status = ?)''', (asset, 'pending'))
-    for order_match in list(cursor):
-        holders.append({'address': order_match['tx1_address'], 'address_quantity': order_match['backward_quantity'], 'escrow': order_match['id']})
+    for tx1_address, backward_quantity, match_id in cursor:
+        yield tx1_address, backward_quantity, match_id
 
     # Bets and RPS (and bet/rps matches) only escrow XCP.
     if asset == config.XCP:
-        cursor.execute('''SELECT * FROM bets \
+        cursor.execute('''SELECT source, wager_remaining, tx_hash FROM bets \
                           WHERE status = ?''', ('open',))
-        for bet in list(cursor):
-            holders.append({'address': bet['source'], 'address_quantity': bet['wager_remaining'], 'escrow': bet['tx_hash']})
-        cursor.execute('''SELECT * FROM bet_matches \
+        for source, wager_remaining, tx_hash in cursor:
+            yield source, wager_remaining, tx_hash
+        cursor.execute('''SELECT tx0_address, forward_quantity, tx1_address, backward_quantity, id FROM bet_matches \
                           WHERE status = ?''', ('pending',))
-        for bet_match in list(cursor):
-            holders.append({'address': bet_match['tx0_address'], 'address_quantity': bet_match['forward_quantity'], 'escrow': bet_match['id']})
-            holders.append({'address': bet_match['tx1_address'], 'address_quantity': bet_match['backward_quantity'], 'escrow': bet_match['id']})
+        for tx0_address, forward_quantity, tx1_address, backward_quantity, match_id in cursor:
+            yield tx0_address, forward_quantity, match_id
+            yield tx1_address, backward_quantity, match_id
 
-        cursor.execute('''SELECT * FROM rps \
+        cursor.execute('''SELECT source, wager, tx_hash FROM rps \
                           WHERE status = ?''', ('open',))
-        for rps in list(cursor):
-            holders.append({'address': rps['source'], 'address_quantity': rps['wager'], 'escrow': rps['tx_hash']})
-        cursor.execute('''SELECT * FROM rps_matches \
+        for source, wager, tx_hash in cursor:
+            yield source, wager, tx_hash
+        cursor.execute('''SELECT tx0_address, tx1_address, wager, id FROM rps_matches \
                           WHERE status IN (?, ?, ?)''', ('pending', 'pending and resolved', 'resolved and pending'))
-        for rps_match in list(cursor):
-            holders.append({'address': rps_match['tx0_address'], 'address_quantity': rps_match['wager'], 'escrow': rps_match['id']})
-            holders.append({'address': rps_match['tx1_address'], 'address_quantity': rps_match['wager'], 'escrow': rps_match['id']})
+        for tx0_address, tx1_address, wager, match_id in cursor:
+            yield tx0_address, wager, match_id
+            yield tx1_address, wager, match_id
 
-        cursor.execute('''SELECT * FROM executions WHERE status IN (?,?)''', ('valid','out of gas'))
-        for execution in list(cursor):
-            holders.append({'address': execution['source'], 'address_quantity': execution['gas_cost'], 'escrow': None})
+        cursor.execute('''SELECT source, gas_cost FROM executions WHERE status IN (?,?)''', ('valid','out of gas'))
+        for source, gas_cost in cursor:
+            yield source, gas_cost, None
 
         # XCP escrowed for not finished executions
-        cursor.execute('''SELECT * FROM executions WHERE status = ?''', ('out of gas',))
-        for execution in list(cursor):
-            holders.append({'address': execution['source'], 'address_quantity': execution['gas_remained'], 'escrow': execution['contract_id']})
+        cursor.execute('''SELECT source, gas_remained, contract_id FROM executions WHERE status = ?''', ('out of gas',))
+        for source, gas_remained, contract_id in cursor:
+            yield source, gas_remained, contract_id
 
     cursor.close()
-    return holders
+
+def holders(db, asset):
+    """Return holders of the asset."""
+    return [{'address': address, 'address_quantity': quantity, 'escrow': escrow}
+            for address, quantity, escrow in holder_rows(db, asset)]
+
+def holders_columnar(db, asset):
+    """Return holders of the asset as (addresses, quantities, escrows) columns."""
+    addresses = []
+    quantities = []
+    escrows = []
+    for address, quantity, escrow in holder_rows(db, asset):
+        addresses.append(address)
+        quantities.append(quantity)
+        escrows.append(escrow)
+    return addresses, quantities, escrows
 
 def xcp_created (db):
     """Return number of XCP created thus far."""
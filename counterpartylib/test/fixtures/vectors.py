@@ -2161,9 +2161,9 @@ UNITTEST_VECTOR = {
             'in': (ADDR[0], DP['quantity'] * 1000, 'DIVISIBLE', 'XCP', DP['default_block_index']),
             'out': (1200000000000,
                     [
-                        {'address_quantity': 100000000, 'dividend_quantity': 100000000000, 'address': 'mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns'},
-                        {'address_quantity': 1000000000, 'dividend_quantity': 1000000000000, 'address': '1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'},
-                        {'address_quantity': 100000000, 'dividend_quantity': 100000000000, 'address': '2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy'}
+                        ('mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 100000000, 100000000000),
+                        ('1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 1000000000, 1000000000000),
+                        ('2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 100000000, 100000000000)
                     ],
                     ['insufficient funds (XCP)'],
                     0)
@@ -2171,9 +2171,9 @@ UNITTEST_VECTOR = {
             'in': (ADDR[0], DP['quantity'] * -1000, 'DIVISIBLE', 'XCP', DP['default_block_index']),
             'out': (-1200000000000,
                     [
-                        {'address': 'mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 'dividend_quantity': -100000000000, 'address_quantity': 100000000},
-                        {'address': '1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 'dividend_quantity': -1000000000000, 'address_quantity': 1000000000},
-                        {'address': '2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 'dividend_quantity': -100000000000, 'address_quantity': 100000000}
+                        ('mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 100000000, -100000000000),
+                        ('1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 1000000000, -1000000000000),
+                        ('2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 100000000, -100000000000)
                     ],
                     ['non‐positive quantity per unit'],
                     0)
@@ -2194,9 +2194,9 @@ UNITTEST_VECTOR = {
             'in': (ADDR[0], 0, 'DIVISIBLE', 'XCP', DP['default_block_index']),
             'out': (0,
                     [
-                        {'dividend_quantity': 0, 'address': 'mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 'address_quantity': 100000000},
-                        {'dividend_quantity': 0, 'address': '1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 'address_quantity': 1000000000},
-                        {'dividend_quantity': 0, 'address': '2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 'address_quantity': 100000000}
+                        ('mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 100000000, 0),
+                        ('1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 1000000000, 0),
+                        ('2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 100000000, 0)
                     ],
                     ['non‐positive quantity per unit', 'zero dividend'],
                     0)
@@ -2204,9 +2204,9 @@ UNITTEST_VECTOR = {
             'in': (ADDR[1], DP['quantity'], 'DIVISIBLE', 'XCP', DP['default_block_index']),
             'out': (99900000000,
                     [
-                        {'address_quantity': 98800000000, 'address': 'mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc', 'dividend_quantity': 98800000000},
-                        {'address_quantity': 1000000000, 'address': '1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 'dividend_quantity': 1000000000},
-                        {'address_quantity': 100000000, 'address': '2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 'dividend_quantity': 100000000}
+                        ('mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc', 98800000000, 98800000000),
+                        ('1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 1000000000, 1000000000),
+                        ('2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 100000000, 100000000)
                     ],
                     ['only issuer can pay dividends', 'insufficient funds (XCP)'],
                     0)
@@ -2217,9 +2217,9 @@ UNITTEST_VECTOR = {
             'in': (ADDR[0], 8359090909, 'DIVISIBLE', 'XCP', DP['default_block_index']),
             'out': (100309090908,
                     [
-                        {'address': 'mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 'dividend_quantity': 8359090909, 'address_quantity': 100000000},
-                        {'address': '1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 'dividend_quantity': 83590909090, 'address_quantity': 1000000000},
-                        {'address': '2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 'dividend_quantity': 8359090909, 'address_quantity': 100000000},
+                        ('mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns', 100000000, 8359090909),
+                        ('1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2', 1000000000, 83590909090),
+                        ('2MyJHMUenMWonC35Yi6PHC7i2tkS7PuomCy', 100000000, 8359090909),
                     ],
                     ['insufficient funds (XCP)'],
                     0)
@@ -2227,7 +2227,7 @@ UNITTEST_VECTOR = {
             'in': (ADDR[2], 100000000, 'DIVIDEND', 'DIVIDEND', DP['default_block_index']),
             'out': (10,
                     [
-                        {'address_quantity': 10, 'address': 'mqPCfvqTfYctXMUfmniXeG2nyaN8w6tPmj', 'dividend_quantity': 10},
+                        ('mqPCfvqTfYctXMUfmniXeG2nyaN8w6tPmj', 10, 10),
                     ],
                     ['insufficient funds (XCP)'],
                     20000)
@@ -2235,7 +2235,7 @@ UNITTEST_VECTOR = {
             'in': (ADDR[2], 2 ** 63, 'DIVIDEND', 'DIVIDEND', DP['default_block_index']),
             'out': (922337203685,
                     [
-                        {'address_quantity': 10, 'address': 'mqPCfvqTfYctXMUfmniXeG2nyaN8w6tPmj', 'dividend_quantity': 922337203685},
+                        ('mqPCfvqTfYctXMUfmniXeG2nyaN8w6tPmj', 10, 922337203685),
                     ],
                     ['integer overflow', 'insufficient funds (DIVIDEND)'],
                     0)
@@ -3848,6 +3848,19 @@ UNITTEST_VECTOR = {
             'in': (ADDR[0], 'BTC', 1.1 * DP['quantity']),
             'error': (CreditError, 'Quantity must be an integer.')
         }],
+        'credit_many': [{
+            'in': ([(ADDR[0], 'XCP', 1), (ADDR[1], 'XCP', 1), (ADDR[0], 'XCP', 1)],),
+            'out': None
+        }, {
+            'in': ([],),
+            'out': None
+        }, {
+            'in': ([(ADDR[0], 'BTC', DP['quantity'])],),
+            'error': (CreditError, 'Cannot debit bitcoins.')
+        }, {
+            'in': ([(ADDR[0], 'XCP', -1 * DP['quantity'])],),
+            'error': (CreditError, 'Negative quantity.')
+        }],
         'is_divisible': [{
             'in': ('XCP',),
             'out': True